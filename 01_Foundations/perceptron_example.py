@@ -6,6 +6,7 @@ Demonstrates binary classification using a perceptron built from scratch.
 
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.linalg import get_blas_funcs
 
 class Perceptron:
     """Simple perceptron classifier"""
@@ -15,75 +16,88 @@ class Perceptron:
         self.n_iterations = n_iterations
         self.weights = None
         self.bias = None
-        
-    def activation(self, x):
-        """Step activation function: returns 1 if x >= 0, else 0"""
-        return np.where(x >= 0, 1, 0)
-    
+
     def fit(self, X, y):
-        """Train the perceptron"""
+        """Train the perceptron using the batch perceptron rule"""
+        # Fortran order so the GEMV kernel runs on the natural layout
+        X = np.asfortranarray(X, dtype=np.float64)
         n_samples, n_features = X.shape
-        
+
         # Initialize weights and bias
         self.weights = np.zeros(n_features)
-        self.bias = 0
-        
-        # Training loop
+        self.bias = 0.0
+
+        # Pin the BLAS GEMV routine once - calling it directly skips
+        # NumPy's per-call dispatch overhead in the epoch loop
+        gemv, = get_blas_funcs(("gemv",), (X, self.weights))
+
+        # Training loop: score the whole dataset in one BLAS call per epoch
+        # instead of looping over samples in Python
         for iteration in range(self.n_iterations):
-            for idx, x_i in enumerate(X):
-                # Calculate linear output
-                linear_output = np.dot(x_i, self.weights) + self.bias
-                # Apply activation function
-                y_predicted = self.activation(linear_output)
-                
-                # Update weights and bias if prediction is wrong
-                update = self.learning_rate * (y[idx] - y_predicted)
-                self.weights += update * x_i
-                self.bias += update
-                
+            scores = gemv(1.0, X, self.weights) + self.bias
+            predictions = (scores >= 0).astype(np.float64)
+            errors = y - predictions
+
+            # Converged - every sample is classified correctly, so the
+            # remaining epochs would be no-ops
+            if not errors.any():
+                break
+
+            # Apply the summed update for all misclassified samples at once
+            self.weights += self.learning_rate * (errors @ X)
+            self.bias += self.learning_rate * errors.sum()
+
         return self
     
     def predict(self, X):
         """Make predictions"""
-        linear_output = np.dot(X, self.weights) + self.bias
-        return self.activation(linear_output)
+        # The step activation is just a threshold, so compare directly
+        # instead of routing through np.where (one less temporary)
+        return (X @ self.weights + self.bias >= 0).astype(np.int8)
 
 def generate_linearly_separable_data(n_samples=100):
     """Generate sample data for binary classification"""
-    np.random.seed(42)
-    
+    rng = np.random.default_rng(42)
+    half = n_samples // 2
+
+    # Fill one preallocated array per output instead of building the
+    # classes separately and copying them together with vstack/concatenate
+    X = np.empty((n_samples, 2))
+    y = np.empty(n_samples)
+
     # Class 0: centered around (2, 2)
-    X1 = np.random.randn(n_samples // 2, 2) + np.array([2, 2])
-    y1 = np.zeros(n_samples // 2)
-    
+    X[:half] = rng.standard_normal((half, 2)) + np.array([2, 2])
+    y[:half] = 0
+
     # Class 1: centered around (5, 5)
-    X2 = np.random.randn(n_samples // 2, 2) + np.array([5, 5])
-    y2 = np.ones(n_samples // 2)
-    
-    # Combine
-    X = np.vstack([X1, X2])
-    y = np.concatenate([y1, y2])
-    
+    X[half:] = rng.standard_normal((n_samples - half, 2)) + np.array([5, 5])
+    y[half:] = 1
+
     # Shuffle
-    indices = np.random.permutation(n_samples)
+    indices = rng.permutation(n_samples)
     X = X[indices]
     y = y[indices]
-    
+
     return X, y
 
 def plot_decision_boundary(X, y, perceptron):
     """Visualize the decision boundary"""
     plt.figure(figsize=(10, 6))
     
-    # Plot data points
-    plt.scatter(X[y == 0][:, 0], X[y == 0][:, 1], 
-                color='blue', marker='o', label='Class 0', alpha=0.6)
-    plt.scatter(X[y == 1][:, 0], X[y == 1][:, 1], 
-                color='red', marker='s', label='Class 1', alpha=0.6)
-    
-    # Plot decision boundary
-    x_min, x_max = X[:, 0].min() - 1, X[:, 0].max() + 1
-    y_min, y_max = X[:, 1].min() - 1, X[:, 1].max() + 1
+    # Plot data points - evaluate the class mask once and reuse it
+    mask0 = (y == 0)
+    X0 = X[mask0]
+    X1 = X[~mask0]
+    plt.scatter(X0[:, 0], X0[:, 1],
+                color='blue', marker='o', label='Class 0', alpha=0.6, rasterized=True)
+    plt.scatter(X1[:, 0], X1[:, 1],
+                color='red', marker='s', label='Class 1', alpha=0.6, rasterized=True)
+    
+    # Plot decision boundary - single pass over X for both axis ranges
+    mins = X.min(axis=0)
+    maxs = X.max(axis=0)
+    x_min, x_max = mins[0] - 1, maxs[0] + 1
+    y_min, y_max = mins[1] - 1, maxs[1] + 1
     
     # Calculate decision boundary line: w1*x1 + w2*x2 + b = 0
     # Solve for x2: x2 = -(w1*x1 + b) / w2
@@ -109,6 +123,7 @@ def plot_decision_boundary(X, y, perceptron):
         print(f"   Note: Could not save plot (display only)")
     
     plt.show()
+    plt.close()
 
 def main():
     print("=" * 60)
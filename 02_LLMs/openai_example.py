@@ -4,12 +4,24 @@ Demonstrates how to use OpenAI's API for various LLM tasks.
 """
 
 import os
-from openai import OpenAI
+import asyncio
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Shared client - constructing AsyncOpenAI() opens a fresh HTTPS connection
+# pool, so all examples reuse one instance (and its keep-alive sockets)
+_client = None
+
+def _get_client():
+    """Return a lazily-created, shared AsyncOpenAI client"""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI()
+    return _client
+
 def check_api_key():
     """Check if OpenAI API key is set"""
     api_key = os.getenv("OPENAI_API_KEY")
@@ -20,19 +32,17 @@ def check_api_key():
         return False
     return True
 
-def simple_chat_completion():
+async def simple_chat_completion():
     """Basic chat completion example"""
-    print("\n" + "=" * 60)
-    print("1. SIMPLE CHAT COMPLETION")
-    print("=" * 60)
-    
-    if not check_api_key():
-        return
-    
-    client = OpenAI()
-    
+    lines = []
+    lines.append("\n" + "=" * 60)
+    lines.append("1. SIMPLE CHAT COMPLETION")
+    lines.append("=" * 60)
+
+    client = _get_client()
+
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that explains AI concepts clearly."},
@@ -41,31 +51,31 @@ def simple_chat_completion():
             temperature=0.7,
             max_tokens=150
         )
-        
+
         answer = response.choices[0].message.content
-        print(f"\n🤖 Assistant: {answer}")
-        print(f"\n📊 Tokens used: {response.usage.total_tokens}")
-        print(f"   - Prompt: {response.usage.prompt_tokens}")
-        print(f"   - Completion: {response.usage.completion_tokens}")
-        
+        lines.append(f"\n🤖 Assistant: {answer}")
+        lines.append(f"\n📊 Tokens used: {response.usage.total_tokens}")
+        lines.append(f"   - Prompt: {response.usage.prompt_tokens}")
+        lines.append(f"   - Completion: {response.usage.completion_tokens}")
+
     except Exception as e:
-        print(f"❌ Error: {e}")
+        lines.append(f"❌ Error: {e}")
+
+    return "\n".join(lines)
 
-def streaming_example():
+async def streaming_example():
     """Streaming response example"""
-    print("\n" + "=" * 60)
-    print("2. STREAMING RESPONSE")
-    print("=" * 60)
-    
-    if not check_api_key():
-        return
-    
-    client = OpenAI()
-    
+    lines = []
+    lines.append("\n" + "=" * 60)
+    lines.append("2. STREAMING RESPONSE")
+    lines.append("=" * 60)
+
+    client = _get_client()
+
     try:
-        print("\n🤖 Assistant: ", end="", flush=True)
-        
-        stream = client.chat.completions.create(
+        chunks = []
+
+        stream = await client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "user", "content": "Write a haiku about artificial intelligence."}
@@ -73,27 +83,27 @@ def streaming_example():
             stream=True,
             temperature=0.8
         )
-        
-        for chunk in stream:
+
+        async for chunk in stream:
             if chunk.choices[0].delta.content:
-                print(chunk.choices[0].delta.content, end="", flush=True)
-        
-        print("\n")
-        
+                chunks.append(chunk.choices[0].delta.content)
+
+        lines.append("\n🤖 Assistant: " + "".join(chunks))
+
     except Exception as e:
-        print(f"\n❌ Error: {e}")
+        lines.append(f"\n❌ Error: {e}")
 
-def function_calling_example():
+    return "\n".join(lines)
+
+async def function_calling_example():
     """Function calling (tool use) example"""
-    print("\n" + "=" * 60)
-    print("3. FUNCTION CALLING")
-    print("=" * 60)
-    
-    if not check_api_key():
-        return
-    
-    client = OpenAI()
-    
+    lines = []
+    lines.append("\n" + "=" * 60)
+    lines.append("3. FUNCTION CALLING")
+    lines.append("=" * 60)
+
+    client = _get_client()
+
     # Define a function
     tools = [
         {
@@ -119,9 +129,9 @@ def function_calling_example():
             }
         }
     ]
-    
+
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "user", "content": "What's the weather like in San Francisco?"}
@@ -129,86 +139,93 @@ def function_calling_example():
             tools=tools,
             tool_choice="auto"
         )
-        
+
         message = response.choices[0].message
-        
+
         if message.tool_calls:
             tool_call = message.tool_calls[0]
-            print(f"\n🔧 Function called: {tool_call.function.name}")
-            print(f"📝 Arguments: {tool_call.function.arguments}")
-            print("\nℹ️  In a real application, you would:")
-            print("   1. Execute the function with these arguments")
-            print("   2. Send the result back to the model")
-            print("   3. Get a natural language response")
+            lines.append(f"\n🔧 Function called: {tool_call.function.name}")
+            lines.append(f"📝 Arguments: {tool_call.function.arguments}")
+            lines.append("\nℹ️  In a real application, you would:")
+            lines.append("   1. Execute the function with these arguments")
+            lines.append("   2. Send the result back to the model")
+            lines.append("   3. Get a natural language response")
         else:
-            print(f"\n🤖 Direct response: {message.content}")
-            
+            lines.append(f"\n🤖 Direct response: {message.content}")
+
     except Exception as e:
-        print(f"❌ Error: {e}")
+        lines.append(f"❌ Error: {e}")
+
+    return "\n".join(lines)
 
-def multi_turn_conversation():
+async def multi_turn_conversation():
     """Multi-turn conversation example"""
     print("\n" + "=" * 60)
     print("4. MULTI-TURN CONVERSATION")
     print("=" * 60)
-    
-    if not check_api_key():
-        return
-    
-    client = OpenAI()
-    
+
+    client = _get_client()
+
     # Conversation history
     messages = [
         {"role": "system", "content": "You are a helpful AI tutor teaching machine learning."}
     ]
-    
+
     conversation = [
         "What is supervised learning?",
         "Can you give me an example?",
         "How is it different from unsupervised learning?"
     ]
-    
+
     try:
         for user_msg in conversation:
             print(f"\n👤 User: {user_msg}")
-            
+
             # Add user message
             messages.append({"role": "user", "content": user_msg})
-            
+
             # Get response
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=messages,
                 max_tokens=150,
                 temperature=0.7
             )
-            
+
             assistant_msg = response.choices[0].message.content
             print(f"🤖 Assistant: {assistant_msg}")
-            
+
             # Add assistant response to history
             messages.append({"role": "assistant", "content": assistant_msg})
-            
+
     except Exception as e:
         print(f"❌ Error: {e}")
 
-def main():
+async def main():
     """Run all examples"""
     print("\n" + "=" * 60)
     print("OPENAI API EXAMPLES")
     print("=" * 60)
-    
+
     # Check if API key is configured
     if not check_api_key():
         print("\n⚠️  Skipping examples - API key not configured")
         return
-    
-    # Run examples
-    simple_chat_completion()
-    streaming_example()
-    function_calling_example()
-    multi_turn_conversation()
-    
+
+    # The first three examples are independent, so issue their requests
+    # concurrently and overlap the network round trips. Each returns its
+    # output as a string so the results still print in order.
+    results = await asyncio.gather(
+        simple_chat_completion(),
+        streaming_example(),
+        function_calling_example()
+    )
+    for result in results:
+        print(result)
+
+    # The conversation turns depend on each other, so this one stays sequential
+    await multi_turn_conversation()
+
     print("\n" + "=" * 60)
     print("✅ All examples completed!")
     print("=" * 60)
@@ -220,4 +237,4 @@ def main():
     print("\n")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
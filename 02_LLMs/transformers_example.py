@@ -3,8 +3,20 @@ Transformers Example
 Demonstrates using Hugging Face transformers library for text generation.
 """
 
+import os
+
+# Must be set before transformers spawns any tokenizer workers - silences
+# the forked-subprocess warning from the Rust tokenizers
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
+from transformers import (
+    AutoTokenizer,
+    AutoModelForCausalLM,
+    pipeline,
+    LogitsProcessor,
+    LogitsProcessorList,
+)
 import warnings
 
 warnings.filterwarnings('ignore')
@@ -17,6 +29,54 @@ def check_device():
         print("   ℹ️  Running on CPU (slower but works everywhere)")
     return device
 
+# Cached pipelines keyed by model name - loading GPT-2 deserializes
+# ~500MB from disk, so all examples using the same model share one
+# instance (and asking for a different model still loads that model)
+_GENERATORS = {}
+
+def load_generator(model_name="gpt2"):
+    """
+    Build (once per model) a text-generation pipeline with a dtype suited
+    to the hardware.
+
+    On CUDA the model loads in bfloat16, halving the bytes moved through
+    the weight matrices (small-batch decode is memory-bound). On CPU,
+    dynamic int8 quantization covers only the LM head: GPT-2's
+    attention/MLP projections are transformers Conv1D modules, which
+    quantize_dynamic does not handle, so the bulk of decode stays fp32.
+    The tied LM head is still ~30% of the weights, so it's worth taking.
+    """
+    if model_name in _GENERATORS:
+        return _GENERATORS[model_name]
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    if torch.cuda.is_available():
+        model = AutoModelForCausalLM.from_pretrained(
+            model_name,
+            torch_dtype=torch.bfloat16,
+            device_map="auto"
+        )
+    else:
+        model = AutoModelForCausalLM.from_pretrained(model_name)
+        # Only the nn.Linear lm_head matches this mapping - see docstring
+        model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+    model.eval()
+
+    # Compile the forward pass - TorchInductor fuses the attention and MLP
+    # ops into a few kernels, removing per-op dispatch overhead that
+    # dominates small-batch decode. The first generate call pays the
+    # compilation cost; later calls reuse the cached kernels.
+    if hasattr(torch, "compile"):
+        model = torch.compile(model, mode="reduce-overhead", fullgraph=False)
+
+    generator = pipeline("text-generation", model=model, tokenizer=tokenizer)
+    _GENERATORS[model_name] = generator
+    return generator
+
 def simple_text_generation():
     """Basic text generation with a small model"""
     print("\n" + "=" * 60)
@@ -29,24 +89,22 @@ def simple_text_generation():
         print(f"\n📦 Loading model: {model_name}")
         print("   (First run will download ~500MB)")
         
-        # Create text generation pipeline
-        generator = pipeline(
-            "text-generation",
-            model=model_name,
-            device=-1  # CPU
-        )
+        # Create text generation pipeline (bf16 on GPU, int8 on CPU)
+        generator = load_generator(model_name)
         
         prompt = "Artificial intelligence is"
         print(f"\n📝 Prompt: '{prompt}'")
         
-        # Generate text
-        outputs = generator(
-            prompt,
-            max_length=50,
-            num_return_sequences=2,
-            temperature=0.8,
-            do_sample=True
-        )
+        # Generate text - inference_mode disables autograd bookkeeping,
+        # which generation never needs
+        with torch.inference_mode():
+            outputs = generator(
+                prompt,
+                max_length=50,
+                num_return_sequences=2,
+                temperature=0.8,
+                do_sample=True
+            )
         
         print("\n🤖 Generated texts:")
         for i, output in enumerate(outputs, 1):
@@ -103,36 +161,57 @@ def model_comparison():
     
     print("\n💡 Recommendation: Start with 'gpt2' or 'distilgpt2'")
 
+class PerRowTemperature(LogitsProcessor):
+    """Logits processor that applies a different temperature to each batch row"""
+
+    def __init__(self, temperatures):
+        self.temperatures = torch.tensor(temperatures).unsqueeze(1)
+
+    def __call__(self, input_ids, scores):
+        return scores / self.temperatures.to(scores.device, scores.dtype)
+
 def controlled_generation():
     """Demonstrate controlled text generation"""
     print("\n" + "=" * 60)
     print("4. CONTROLLED GENERATION")
     print("=" * 60)
-    
+
     try:
-        generator = pipeline("text-generation", model="gpt2", device=-1)
-        
+        generator = load_generator("gpt2")
+        model = generator.model
+        tokenizer = generator.tokenizer
+
         prompt = "The future of machine learning is"
         print(f"\n📝 Prompt: '{prompt}'")
-        
+
         # Different temperature settings
         temperatures = [0.3, 0.7, 1.2]
-        
-        for temp in temperatures:
-            print(f"\n🌡️  Temperature: {temp}")
-            output = generator(
-                prompt,
-                max_length=30,
-                temperature=temp,
+
+        # Replicate the prompt into one batch and sample all three
+        # temperatures in a single generate call - the prompt's prefill
+        # pass is shared instead of recomputed per temperature
+        inputs = tokenizer([prompt] * len(temperatures), return_tensors="pt")
+        inputs = inputs.to(model.device)
+
+        with torch.inference_mode():
+            outputs = model.generate(
+                **inputs,
+                max_new_tokens=20,
                 do_sample=True,
-                num_return_sequences=1
-            )[0]['generated_text']
-            
-            print(f"   {output}")
-        
+                logits_processor=LogitsProcessorList(
+                    [PerRowTemperature(temperatures)]
+                ),
+                pad_token_id=tokenizer.eos_token_id
+            )
+
+        texts = tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        for temp, text in zip(temperatures, texts):
+            print(f"\n🌡️  Temperature: {temp}")
+            print(f"   {text}")
+
         print("\n💡 Lower temperature = more deterministic")
         print("   Higher temperature = more creative/random")
-        
+
     except Exception as e:
         print(f"❌ Error: {e}")
 
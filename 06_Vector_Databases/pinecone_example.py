@@ -5,33 +5,24 @@ Note: Requires Pinecone API key and may incur costs.
 """
 
 import os
-from dotenv import load_dotenv
+import sys
+from dotenv import dotenv_values
 
-# Load environment variables
-load_dotenv()
+# Parse .env once into a dict (one disk read) instead of re-walking the
+# filesystem on every import; real environment variables take precedence
+_ENV = {**dotenv_values(), **os.environ}
 
 def check_pinecone_key():
     """Check if Pinecone API key is set"""
-    api_key = os.getenv("PINECONE_API_KEY")
+    api_key = _ENV.get("PINECONE_API_KEY")
     if not api_key or api_key == "your_pinecone_api_key_here":
         return False
     return True
 
-def simulate_pinecone_example():
-    """
-    Simulated Pinecone example (actual usage requires: pip install pinecone-client)
-    """
-    
-    print("=" * 60)
-    print("PINECONE VECTOR DATABASE EXAMPLE (SIMULATED)")
-    print("=" * 60)
-    
-    print("\n📋 Pinecone is a cloud-hosted vector database")
-    print("   Perfect for production applications at scale")
-    
-    # Show the actual code structure
-    print("\n1. Initialization (Actual Code):")
-    print("""
+# The code samples shown by the simulated walkthrough, built once at
+# module load - each is emitted with a single stdout write instead of a
+# run of print calls (one GIL acquire + format + write syscall apiece)
+_INIT_CODE = """
     import pinecone
     
     # Initialize Pinecone
@@ -51,10 +42,9 @@ def simulate_pinecone_example():
     
     # Connect to index
     index = pinecone.Index(index_name)
-    """)
-    
-    print("\n2. Upserting Vectors (Actual Code):")
-    print("""
+    """
+
+_UPSERT_CODE = """
     from openai import OpenAI
     
     client = OpenAI()
@@ -83,10 +73,9 @@ def simulate_pinecone_example():
         })
     
     index.upsert(vectors=vectors)
-    """)
-    
-    print("\n3. Querying (Actual Code):")
-    print("""
+    """
+
+_QUERY_CODE = """
     # Generate query embedding
     query = "What are language models?"
     query_embedding = client.embeddings.create(
@@ -106,10 +95,9 @@ def simulate_pinecone_example():
     for match in results['matches']:
         print(f"Score: {match['score']:.4f}")
         print(f"Text: {match['metadata']['text']}")
-    """)
-    
-    print("\n4. Advanced Features:")
-    print("""
+    """
+
+_ADVANCED_CODE = """
     # Namespace isolation
     index.upsert(vectors=vectors, namespace="user_123")
     results = index.query(
@@ -127,41 +115,63 @@ def simulate_pinecone_example():
     # Get statistics
     stats = index.describe_index_stats()
     print(f"Total vectors: {stats['total_vector_count']}")
-    """)
+    """
+
+def simulate_pinecone_example():
+    """
+    Simulated Pinecone example (actual usage requires: pip install pinecone-client)
+    """
+
+    sys.stdout.write('\n'.join([
+        "=" * 60,
+        "PINECONE VECTOR DATABASE EXAMPLE (SIMULATED)",
+        "=" * 60,
+        "",
+        "\n📋 Pinecone is a cloud-hosted vector database",
+        "   Perfect for production applications at scale",
+        "",
+        "\n1. Initialization (Actual Code):",
+        _INIT_CODE,
+        "",
+        "\n2. Upserting Vectors (Actual Code):",
+        _UPSERT_CODE,
+        "",
+        "\n3. Querying (Actual Code):",
+        _QUERY_CODE,
+        "",
+        "\n4. Advanced Features:",
+        _ADVANCED_CODE,
+    ]) + '\n')
 
 def show_pinecone_features():
     """Show Pinecone key features"""
-    print("\n" + "=" * 60)
-    print("PINECONE KEY FEATURES")
-    print("=" * 60)
-    
-    print("\n✨ Cloud-Native")
-    print("   • Fully managed service")
-    print("   • No infrastructure management")
-    print("   • Automatic scaling")
-    
-    print("\n⚡ High Performance")
-    print("   • Sub-10ms query latency")
-    print("   • Billions of vectors")
-    print("   • Horizontal scaling")
-    
-    print("\n🔒 Production-Ready")
-    print("   • 99.9% uptime SLA")
-    print("   • Built-in security")
-    print("   • Multi-region support")
-    
-    print("\n🛠️ Developer-Friendly")
-    print("   • Simple API")
-    print("   • Multiple language SDKs")
-    print("   • Excellent documentation")
+    sys.stdout.write('\n'.join([
+        "\n" + "=" * 60,
+        "PINECONE KEY FEATURES",
+        "=" * 60,
+        "",
+        "\n✨ Cloud-Native",
+        "   • Fully managed service",
+        "   • No infrastructure management",
+        "   • Automatic scaling",
+        "",
+        "\n⚡ High Performance",
+        "   • Sub-10ms query latency",
+        "   • Billions of vectors",
+        "   • Horizontal scaling",
+        "",
+        "\n🔒 Production-Ready",
+        "   • 99.9% uptime SLA",
+        "   • Built-in security",
+        "   • Multi-region support",
+        "",
+        "\n🛠️ Developer-Friendly",
+        "   • Simple API",
+        "   • Multiple language SDKs",
+        "   • Excellent documentation",
+    ]) + '\n')
 
-def compare_vector_databases():
-    """Compare different vector database options"""
-    print("\n" + "=" * 60)
-    print("VECTOR DATABASE COMPARISON")
-    print("=" * 60)
-    
-    comparison = """
+_COMPARISON = """
     
     ┌──────────────┬──────────────┬──────────────┬──────────────┐
     │   Feature    │   ChromaDB   │   Pinecone   │   Weaviate   │
@@ -194,7 +204,15 @@ def compare_vector_databases():
       ✓ Complex filtering needs
       ✓ GraphQL interface
     """
-    print(comparison)
+
+def compare_vector_databases():
+    """Compare different vector database options"""
+    sys.stdout.write('\n'.join([
+        "\n" + "=" * 60,
+        "VECTOR DATABASE COMPARISON",
+        "=" * 60,
+        _COMPARISON,
+    ]) + '\n')
 
 def main():
     """Run Pinecone examples"""
@@ -238,4 +256,8 @@ def main():
     print("\n")
 
 if __name__ == "__main__":
+    # Block-buffer stdout for the demo run - the scripts print dozens of
+    # short lines, so batch them instead of paying a flush per line
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
     main()
+    sys.stdout.flush()